@@ -2,25 +2,39 @@ from __future__ import annotations
 
 __all__ = ["Defer"]
 
-import re
 import sys
-from collections.abc import Callable
-from types import CellType, FunctionType
+from dis import hasfree, haslocal
+from opcode import opmap
+from types import CellType, CodeType, FunctionType
 from typing import Any, Final, Literal, cast, final
 from warnings import warn
+from weakref import ReferenceType, ref
 
-from .._deferred_actions import DeferredAction, ensure_deferred_actions
+from .._deferred_actions import ensure_deferred_actions
 from ..._utils import (
-    Opcode,
+    CodeCache,
+    COPY_FREE_VARS,
+    DELETE_DEREF,
+    EXTENDED_ARG,
+    LOAD_DEREF,
+    MAKE_CELL,
+    POP_TOP,
+    RESUME,
+    RETURN_VALUE,
+    STORE_DEREF,
+    STORE_FAST,
+    append_instruction_code_bytes,
     build_instruction_code_bytes,
-    build_instruction_pattern,
+    build_single_line_table,
     extract_argument_from_instruction,
     get_code_location,
-    get_outer_frame,
+    iterate_instructions,
 )
 
 _MISSING = cast("Any", object())
 
+_getframe = sys._getframe  # pyright: ignore[reportPrivateUsage]
+
 
 class Defer:
     @staticmethod
@@ -34,98 +48,359 @@ class Defer:
         and a warning will be emitted.
         """
 
-        frame = get_outer_frame()
+        frame = _getframe(1)
 
         code = frame.f_code
-        code_bytes = code.co_code
-
         i_code_byte = frame.f_lasti
-        for _ in range(3):
-            temp_i_code_byte = i_code_byte - 2
-            if temp_i_code_byte < 0 or code_bytes[temp_i_code_byte] != Opcode.EXTENDED_ARG:
-                break
-            i_code_byte = temp_i_code_byte
-        code_bytes_0 = code_bytes[i_code_byte:]
-
-        match_0 = re.match(_PATTERN_0, code_bytes_0)
-        if match_0 is None:
-            code_location = get_code_location(frame)
-            message = (
-                f"Method `defer.__bool__()` is called in an unsupported way ({code_location}). It is only designed to"
-                " be invoked during `defer and ...`."
-            )
-            warn(message)
-            return False
-
-        n_skipped_bytes = extract_argument_from_instruction(match_0.group(1)) * 2
-        code_bytes_1 = match_0.group(2)[:n_skipped_bytes]
 
-        match_1 = re.fullmatch(_PATTERN_1, code_bytes_1)
-        assert match_1 is not None
-        code_bytes_2 = match_1.group(1)
+        sites = _sites_cache.get(code)
+        if sites is None:
+            sites = {}
+            _sites_cache.set(code, sites)
+
+        site = sites.get(i_code_byte)
+        if site is None:
+            site = _DeferSite.build(code, i_code_byte, frame.f_lineno)
+            if site is None:
+                # Unsupported sites are recorded with their warning messages, which never change.
+                code_location = get_code_location(frame)
+                site = (
+                    f"Method `defer.__bool__()` is called in an unsupported way ({code_location}). It is only designed"
+                    " to be invoked during `defer and ...`."
+                )
+            sites[i_code_byte] = site
+
+        if isinstance(site, str):
+            warn(site)
+            return False
 
         global_scope = frame.f_globals
         local_scope = frame.f_locals
 
-        dummy_code_bytes = bytes()
-        dummy_closure = ()
-        dummy_consts = code.co_consts
+        # Take a snapshot of the variables that are to be passed into the dummy function. They are usually only a few of
+        # all the variables in the local scope, so they are looked up one by one. Like free variables below, they are
+        # mostly bound, so looking them up directly is faster than using a default.
+        captured_var_values: list[Any] = []
+        for name in site.captured_var_names:
+            try:
+                value = local_scope[name]
+            except KeyError:
+                captured_var_values.append(_MISSING)
+            else:
+                captured_var_values.append(value)
 
-        # If the original function has local variables, pass their current values by appending these values to constants
-        # and using some instruction pairs of "LOAD_CONST" and "STORE_FAST".
-        local_var_names = code.co_varnames
-        for i_local_var, name in enumerate(local_var_names):
-            if (value := local_scope.get(name, _MISSING)) is _MISSING:
-                # The value does not exist, so there is nothing to store.
+        dummy_code = site.get_dummy_code(code, tuple(value is not _MISSING for value in captured_var_values))
+
+        # The closure holds current values of the original free variables, followed by those of the bound captured
+        # variables. Free variables that are not referenced in the RHS are never touched by the dummy function, so they
+        # all share one empty cell.
+        dummy_closure_list: list[CellType] = []
+        for name in site.referenced_free_var_names:
+            if name is None:
+                dummy_closure_list.append(_UNUSED_CELL)
                 continue
+            try:
+                value = local_scope[name]
+            except KeyError:
+                dummy_closure_list.append(CellType())
+            else:
+                dummy_closure_list.append(CellType(value))
+        dummy_closure_list += (CellType(value) for value in captured_var_values if value is not _MISSING)
+        dummy_closure = tuple(dummy_closure_list)
+
+        if all(cell is _UNUSED_CELL for cell in dummy_closure):
+            # Nothing in the dummy function depends on runtime values, so the same function can be reused.
+            new_function = site.get_static_function(dummy_code, global_scope, dummy_closure)
+        else:
+            new_function = FunctionType(code=dummy_code, globals=global_scope, closure=dummy_closure)
+
+        deferred_actions = ensure_deferred_actions(frame)
+        deferred_actions.append(new_function)
+
+        return False
+
+
+if sys.version_info >= (3, 13) and sys.version_info < (3, 14):
+    from ..._utils import JUMP_BACKWARD, POP_JUMP_IF_FALSE, TO_BOOL
+
+    def _extract_rhs_code_bytes(code_bytes: bytes, i_code_byte: int, /) -> bytes | None:
+        # ```
+        #     LOAD_GLOBAL ? (defer)
+        #     COPY
+        # --> TO_BOOL
+        #     POP_JUMP_IF_FALSE ?
+        #     POP_TOP
+        #     <???>
+        #     [POP_TOP]
+        #     [JUMP_BACKWARD ?]
+        # ```
+
+        if code_bytes[i_code_byte] != TO_BOOL:
+            return None
+        i_code_byte += _TO_BOOL_SIZE
+
+        while code_bytes[i_code_byte] == EXTENDED_ARG:
+            i_code_byte += 2
+        if code_bytes[i_code_byte] != POP_JUMP_IF_FALSE:
+            return None
+        n_skipped_bytes = extract_argument_from_instruction(code_bytes, i_code_byte) * 2
+        i_code_byte += _POP_JUMP_IF_FALSE_SIZE
+
+        if code_bytes[i_code_byte] != POP_TOP:
+            return None
+        i_rhs_start = i_code_byte + _POP_TOP_SIZE
+        i_rhs_stop = i_code_byte + n_skipped_bytes
+
+        # In a loop, the trailing "POP_TOP" and "JUMP_BACKWARD" may get duplicated into the RHS. They are not part of
+        # the RHS and should be dropped.
+        i_temp_code_byte = i_rhs_stop - _JUMP_BACKWARD_SIZE
+        if i_temp_code_byte >= i_rhs_start and code_bytes[i_temp_code_byte] == JUMP_BACKWARD:
+            while code_bytes[i_temp_code_byte - 2] == EXTENDED_ARG:
+                i_temp_code_byte -= 2
+            i_temp_code_byte -= _POP_TOP_SIZE
+            if i_temp_code_byte >= i_rhs_start and code_bytes[i_temp_code_byte] == POP_TOP:
+                i_rhs_stop = i_temp_code_byte
+
+        return code_bytes[i_rhs_start:i_rhs_stop]
+
+    _TO_BOOL_SIZE = len(build_instruction_code_bytes(TO_BOOL))
+    _POP_JUMP_IF_FALSE_SIZE = len(build_instruction_code_bytes(POP_JUMP_IF_FALSE))
+    _POP_TOP_SIZE = len(build_instruction_code_bytes(POP_TOP))
+    _JUMP_BACKWARD_SIZE = len(build_instruction_code_bytes(JUMP_BACKWARD))
+
+if sys.version_info >= (3, 12) and sys.version_info < (3, 13):
+    from ..._utils import POP_JUMP_IF_FALSE
+
+    def _extract_rhs_code_bytes(code_bytes: bytes, i_code_byte: int, /) -> bytes | None:
+        # ```
+        #     LOAD_GLOBAL ? (defer)
+        #     COPY
+        # --> POP_JUMP_IF_FALSE ?
+        #     POP_TOP
+        #     <???>
+        # ```
+
+        if code_bytes[i_code_byte] != POP_JUMP_IF_FALSE:
+            return None
+        n_skipped_bytes = extract_argument_from_instruction(code_bytes, i_code_byte) * 2
+        i_code_byte += _POP_JUMP_IF_FALSE_SIZE
+
+        if code_bytes[i_code_byte] != POP_TOP:
+            return None
+        i_rhs_start = i_code_byte + _POP_TOP_SIZE
+        i_rhs_stop = i_code_byte + n_skipped_bytes
+
+        return code_bytes[i_rhs_start:i_rhs_stop]
+
+    _POP_JUMP_IF_FALSE_SIZE = len(build_instruction_code_bytes(POP_JUMP_IF_FALSE))
+    _POP_TOP_SIZE = len(build_instruction_code_bytes(POP_TOP))
+
+if sys.version_info >= (3, 11) and sys.version_info < (3, 12):
+    from ..._utils import JUMP_IF_FALSE_OR_POP
+
+    def _extract_rhs_code_bytes(code_bytes: bytes, i_code_byte: int, /) -> bytes | None:
+        # ```
+        #     LOAD_GLOBAL ? (defer)
+        # --> JUMP_IF_FALSE_OR_POP ?
+        #     <???>
+        # ```
+
+        if code_bytes[i_code_byte] != JUMP_IF_FALSE_OR_POP:
+            return None
+        n_skipped_bytes = extract_argument_from_instruction(code_bytes, i_code_byte) * 2
+        i_code_byte += _JUMP_IF_FALSE_OR_POP_SIZE
+
+        i_rhs_start = i_code_byte
+        i_rhs_stop = i_code_byte + n_skipped_bytes
+
+        return code_bytes[i_rhs_start:i_rhs_stop]
+
+    _JUMP_IF_FALSE_OR_POP_SIZE = len(build_instruction_code_bytes(JUMP_IF_FALSE_OR_POP))
+
+
+@final
+class _DeferSite:
+    """
+    Everything about one `defer and ...` site that does not depend on
+    runtime values.
+
+    The code object itself is not kept, as it is the key that the site
+    is cached with.
+    """
+
+    _local_var_names: Final[tuple[str, ...]]
+    _cell_var_names: Final[tuple[str, ...]]
+    _free_var_names: Final[tuple[str, ...]]
+    _rhs_code_bytes: Final[bytes]
+    _line_delta: Final[int]
+    _dummy_codes: Final[dict[tuple[bool, ...], CodeType]]
+    _captured_var_slots: Final[tuple[int, ...]]
+    _static_function_ref: ReferenceType[FunctionType] | None
+
+    captured_var_names: Final[tuple[str, ...]]
+    """
+    Names of variables whose values are to be passed into the dummy
+    function, in the order of their slots.
+    """
+
+    referenced_free_var_names: Final[tuple[str | None, ...]]
+    """
+    Names of the original free variables, with those not referenced in
+    the RHS replaced by `None`.
+    """
+
+    def __init__(self, code: CodeType, rhs_code_bytes: bytes, line_number: int, /) -> None:
+        self._local_var_names = code.co_varnames
+        self._cell_var_names = code.co_cellvars
+        self._free_var_names = code.co_freevars
+        self._rhs_code_bytes = rhs_code_bytes
+        self._line_delta = line_number - code.co_firstlineno
+        self._dummy_codes = {}
+        self._static_function_ref = None
+
+        # Slots of local variables and non-local cell variables, in the same order as "fast locals".
+        local_var_names = code.co_varnames
+        var_names = local_var_names + tuple(name for name in code.co_cellvars if name not in local_var_names)
+
+        # Only variables that are referenced in the RHS need to be captured, unless the RHS may read the local scope
+        # implicitly.
+        # Free variables come right after them.
+        n_var_slots = len(var_names)
+        free_var_names = code.co_freevars
+        if _IMPLICIT_LOCAL_SCOPE_READER_NAMES.isdisjoint(code.co_names):
+            referenced_var_slots = _find_referenced_var_slots(rhs_code_bytes)
+            captured_var_slots = tuple(i for i in range(n_var_slots) if i in referenced_var_slots)
+            referenced_free_var_names = tuple(
+                name if n_var_slots + i in referenced_var_slots else None for i, name in enumerate(free_var_names)
+            )
+        else:
+            captured_var_slots = tuple(range(n_var_slots))
+            referenced_free_var_names = free_var_names
 
-            dummy_code_bytes += build_instruction_code_bytes(Opcode.LOAD_CONST, len(dummy_consts))
-            dummy_code_bytes += build_instruction_code_bytes(Opcode.STORE_FAST, i_local_var)
-            dummy_consts += (value,)
+        self._captured_var_slots = captured_var_slots
+        self.captured_var_names = tuple(var_names[i_slot] for i_slot in captured_var_slots)
+        self.referenced_free_var_names = referenced_free_var_names
+
+    @staticmethod
+    def build(code: CodeType, i_code_byte: int, line_number: int, /) -> _DeferSite | None:
+        """
+        Returns `None` if the code at the given position is not a
+        `defer and ...` expression.
+        """
+
+        rhs_code_bytes = _extract_rhs_code_bytes(code.co_code, i_code_byte)
+        if rhs_code_bytes is None:
+            return None
+
+        return _DeferSite(code, rhs_code_bytes, line_number)
+
+    def get_dummy_code(self, code: CodeType, captured_var_mask: tuple[bool, ...], /) -> CodeType:
+        """
+        Returns the dummy code for the given set of bound captured
+        variables, based on the code object that the site belongs to.
+
+        Values of the bound captured variables are expected to follow
+        values of the original free variables in the closure.
+        """
+
+        dummy_code = self._dummy_codes.get(captured_var_mask)
+        if dummy_code is None:
+            dummy_code = self._build_dummy_code(code, captured_var_mask)
+            self._dummy_codes[captured_var_mask] = dummy_code
+
+        return dummy_code
+
+    def get_static_function(
+        self, dummy_code: CodeType, global_scope: dict[str, Any], dummy_closure: tuple[CellType, ...], /
+    ) -> FunctionType:
+        """
+        Returns a dummy function that takes neither captured variables
+        nor referenced free variables.
+
+        The function is reused for as long as it is alive and the global
+        scope stays the same. It is only weakly referenced, so that the
+        site never keeps the global scope alive.
+        """
+
+        static_function_ref = self._static_function_ref
+        static_function = None if static_function_ref is None else static_function_ref()
+        if static_function is None or static_function.__globals__ is not global_scope:
+            static_function = FunctionType(code=dummy_code, globals=global_scope, closure=dummy_closure)
+            self._static_function_ref = ref(static_function)
+
+        return static_function
+
+    def _build_dummy_code(self, code: CodeType, captured_var_mask: tuple[bool, ...], /) -> CodeType:
+        dummy_code_bytes = bytearray()
+
+        local_var_names = self._local_var_names
+        cell_var_names = self._cell_var_names
+        free_var_names = self._free_var_names
+        n_local_vars = len(local_var_names)
+        local_var_indices = {name: i for i, name in enumerate(local_var_names)}
+        n_nonlocal_cell_vars = sum(1 for name in cell_var_names if name not in local_var_indices)
+
+        bound_captured_var_slots = tuple(
+            i_slot for i_slot, is_bound in zip(self._captured_var_slots, captured_var_mask) if is_bound
+        )
+
+        # Values of bound captured variables are passed in as extra free variables, which come after all the existing
+        # "fast locals".
+        extra_free_var_names = tuple(f"<captured {i_slot}>" for i_slot in bound_captured_var_slots)
+        i_first_extra_free_var = n_local_vars + n_nonlocal_cell_vars + len(free_var_names)
+        i_next_extra_free_var = i_first_extra_free_var
+
+        # Add a "COPY_FREE_VARS" instruction for both the original free variables and the extra ones. The closure will
+        # be created based on their current values.
+        n_free_vars = len(free_var_names) + len(extra_free_var_names)
+        if n_free_vars != 0:
+            append_instruction_code_bytes(dummy_code_bytes, COPY_FREE_VARS, n_free_vars)
+
+        # For captured local variables, pass their current values by using some instruction pairs of "LOAD_DEREF" and
+        # "STORE_FAST".
+        for i_slot in bound_captured_var_slots:
+            if i_slot < n_local_vars:
+                append_instruction_code_bytes(dummy_code_bytes, LOAD_DEREF, i_next_extra_free_var)
+                append_instruction_code_bytes(dummy_code_bytes, STORE_FAST, i_slot)
+                i_next_extra_free_var += 1
 
         # If the original function has cell variables, add some instructions of "MAKE_CELL".
-        # For non-local cell variables, pass their current values by appending these values to constants and using some
-        # instruction pairs of "LOAD_CONST" and "STORE_DEREF".
-        cell_var_names = code.co_cellvars
-        next_i_nonlocal_cell_var = len(local_var_names)
+        next_i_nonlocal_cell_var = n_local_vars
         for name in cell_var_names:
-            try:
-                i_local_var = local_var_names.index(name)
-            except ValueError:
-                i_local_var = None
-
+            i_local_var = local_var_indices.get(name)
             if i_local_var is not None:
-                dummy_code_bytes += build_instruction_code_bytes(Opcode.MAKE_CELL, i_local_var)
+                append_instruction_code_bytes(dummy_code_bytes, MAKE_CELL, i_local_var)
             else:
-                i_nonlocal_cell_var = next_i_nonlocal_cell_var
+                append_instruction_code_bytes(dummy_code_bytes, MAKE_CELL, next_i_nonlocal_cell_var)
                 next_i_nonlocal_cell_var += 1
 
-                dummy_code_bytes += build_instruction_code_bytes(Opcode.MAKE_CELL, i_nonlocal_cell_var)
-
-                if (value := local_scope.get(name, _MISSING)) is _MISSING:
-                    # The value does not exist, so there is nothing to store.
-                    continue
+        # For captured non-local cell variables, pass their current values by using some instruction pairs of
+        # "LOAD_DEREF" and "STORE_DEREF".
+        for i_slot in bound_captured_var_slots:
+            if i_slot >= n_local_vars:
+                append_instruction_code_bytes(dummy_code_bytes, LOAD_DEREF, i_next_extra_free_var)
+                append_instruction_code_bytes(dummy_code_bytes, STORE_DEREF, i_slot)
+                i_next_extra_free_var += 1
 
-                dummy_code_bytes += build_instruction_code_bytes(Opcode.LOAD_CONST, len(dummy_consts))
-                dummy_code_bytes += build_instruction_code_bytes(Opcode.STORE_DEREF, i_nonlocal_cell_var)
-                dummy_consts += (value,)
+        # The extra free variables have served their purpose. Unbind them, so that they never show up in `locals()` and
+        # the like.
+        for i_extra_free_var in range(i_first_extra_free_var, i_next_extra_free_var):
+            append_instruction_code_bytes(dummy_code_bytes, DELETE_DEREF, i_extra_free_var)
 
-        # If the original function has free variables, create a closure based on their current values, and add a
-        # "COPY_FREE_VARS" instruction.
-        free_var_names = code.co_freevars
-        n_free_vars = len(free_var_names)
-        if n_free_vars != 0:
-            dummy_closure += tuple(
-                (CellType() if (value := frame.f_locals.get(name, _MISSING)) is _MISSING else CellType(value))
-                for name in free_var_names
-            )
-            dummy_code_bytes += build_instruction_code_bytes(Opcode.COPY_FREE_VARS, n_free_vars)
+        # End the prologue with a "RESUME" instruction, like any ordinary function does. Without it, the interpreter
+        # would take the frame as incomplete and skip it in `locals()`, `sys._getframe()` and so on.
+        append_instruction_code_bytes(dummy_code_bytes, RESUME, 0)
 
         # Copy the bytecode of the RHS part in `defer and ...` into the dummy function.
-        dummy_code_bytes += code_bytes_2
+        dummy_code_bytes += self._rhs_code_bytes
 
         # The dummy function should return something. The simplest way is to return whatever value is currently active.
-        dummy_code_bytes += build_instruction_code_bytes(Opcode.RETURN_VALUE)
+        append_instruction_code_bytes(dummy_code_bytes, RETURN_VALUE)
+
+        # All instructions are mapped to the line of the `defer and ...` expression, so that tracebacks can show where the
+        # deferred action comes from.
+        dummy_code_bytes = bytes(dummy_code_bytes)
+        dummy_line_table = build_single_line_table(len(dummy_code_bytes), self._line_delta)
 
         # The dummy function will be called with no argument.
         dummy_code = code.replace(
@@ -133,105 +408,52 @@ class Defer:
             co_posonlyargcount=0,
             co_kwonlyargcount=0,
             co_code=dummy_code_bytes,
-            co_consts=dummy_consts,
-            co_linetable=bytes(),
+            co_freevars=(free_var_names + extra_free_var_names),
+            co_linetable=dummy_line_table,
             co_exceptiontable=bytes(),
         )
+        return dummy_code
 
-        new_function = FunctionType(code=dummy_code, globals=global_scope, closure=dummy_closure)
-        deferred_call = _DeferredCall(new_function)
 
-        deferred_actions = ensure_deferred_actions(frame)
-        deferred_actions.append(deferred_call)
+_UNUSED_CELL: Final = CellType()
+"""
+The cell passed for every free variable that the dummy function never
+touches.
+"""
 
-        return False
+_IMPLICIT_LOCAL_SCOPE_READER_NAMES = frozenset(["dir", "eval", "exec", "locals", "vars"])
+"""
+Names of built-in functions that may read the local scope without
+referencing any variable explicitly.
+"""
 
+_VAR_OPCODES = frozenset(haslocal) | frozenset(hasfree)
 
-if sys.version_info >= (3, 13) and sys.version_info < (3, 14):
-    # ```
-    #     LOAD_GLOBAL ? (defer)
-    #     COPY
-    # --> TO_BOOL
-    #     POP_JUMP_IF_FALSE ?
-    #     POP_TOP
-    #     <???>
-    # ```
-
-    _PATTERN_0 = re.compile(
-        pattern=(
-            (
-                "%(TO_BOOL)s(%(POP_JUMP_IF_FALSE)s)(%(POP_TOP)s.*)"
-                % {
-                    "TO_BOOL": build_instruction_pattern(Opcode.TO_BOOL),
-                    "POP_JUMP_IF_FALSE": build_instruction_pattern(Opcode.POP_JUMP_IF_FALSE),
-                    "POP_TOP": build_instruction_pattern(Opcode.POP_TOP),
-                }
-            ).encode("iso8859-1")
-        ),
-        flags=re.DOTALL,
-    )
-    _PATTERN_1 = re.compile(
-        pattern=(
-            (
-                "%(POP_TOP)s(.*?)(?:%(POP_TOP)s%(JUMP_BACKWARD)s)?"
-                % {
-                    "POP_TOP": build_instruction_pattern(Opcode.POP_TOP),
-                    "JUMP_BACKWARD": build_instruction_pattern(Opcode.JUMP_BACKWARD),
-                }
-            ).encode("iso8859-1")
-        ),
-        flags=re.DOTALL,
-    )
+# Some instructions in Python 3.13 pack two variable slots into one argument.
+_VAR_PAIR_OPCODES = frozenset(
+    opmap[name] for name in ["LOAD_FAST_LOAD_FAST", "STORE_FAST_LOAD_FAST", "STORE_FAST_STORE_FAST"] if name in opmap
+)
 
-if sys.version_info >= (3, 12) and sys.version_info < (3, 13):
-    # ```
-    #     LOAD_GLOBAL ? (defer)
-    #     COPY
-    # --> POP_JUMP_IF_FALSE ?
-    #     POP_TOP
-    #     <???>
-    # ```
-
-    _PATTERN_0 = re.compile(
-        pattern=(
-            (
-                "(%(POP_JUMP_IF_FALSE)s)(%(POP_TOP)s.*)"
-                % {
-                    "POP_JUMP_IF_FALSE": build_instruction_pattern(Opcode.POP_JUMP_IF_FALSE),
-                    "POP_TOP": build_instruction_pattern(Opcode.POP_TOP),
-                }
-            ).encode("iso8859-1")
-        ),
-        flags=re.DOTALL,
-    )
-    _PATTERN_1 = re.compile(
-        pattern=(("%(POP_TOP)s(.*)" % {"POP_TOP": build_instruction_pattern(Opcode.POP_TOP)}).encode("iso8859-1")),
-        flags=re.DOTALL,
-    )
 
-if sys.version_info >= (3, 11) and sys.version_info < (3, 12):
-    # ```
-    #     LOAD_GLOBAL ? (defer)
-    # --> JUMP_IF_FALSE_OR_POP ?
-    #     <???>
-    # ```
-
-    _PATTERN_0 = re.compile(
-        pattern=(
-            (
-                "(%(JUMP_IF_FALSE_OR_POP)s)(.*)"
-                % {"JUMP_IF_FALSE_OR_POP": build_instruction_pattern(Opcode.JUMP_IF_FALSE_OR_POP)}
-            ).encode("iso8859-1")
-        ),
-        flags=re.DOTALL,
-    )
-    _PATTERN_1 = re.compile(pattern="(.*)".encode("iso8859-1"), flags=re.DOTALL)
+def _find_referenced_var_slots(code_bytes: bytes, /) -> set[int]:
+    """
+    Finds slots of all variables that are referenced in the given code
+    bytes.
+    """
 
+    var_slots: set[int] = set()
+    for opcode, argument in iterate_instructions(code_bytes):
+        if opcode in _VAR_OPCODES:
+            if opcode in _VAR_PAIR_OPCODES:
+                var_slots.add(argument >> 4)
+                var_slots.add(argument & 0xF)
+            else:
+                var_slots.add(argument)
+    return var_slots
 
-@final
-class _DeferredCall(DeferredAction):
-    def __init__(self, body: Callable[[], Any], /) -> None:
-        self._body: Final = body
 
-    def perform(self, /) -> None:
-        self._body()
+_sites_cache = CodeCache[dict[int, _DeferSite | str]]()
+"""
+Maps each code object to its visited sites, keyed by byte offset. An
+unsupported site is mapped to the warning message to emit.
+"""
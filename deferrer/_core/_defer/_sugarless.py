@@ -2,15 +2,18 @@ from __future__ import annotations
 
 __all__ = ["Defer"]
 
+import sys
 from collections.abc import Callable
 from typing import Any, Final, Generic, ParamSpec, final
 from warnings import warn
 
-from .._deferred_actions import DeferredAction, ensure_deferred_actions
-from ..._utils import get_code_location, get_outer_frame
+from .._deferred_actions import ensure_deferred_actions
+from ..._utils import format_code_location
 
 _P = ParamSpec("_P")
 
+_getframe = sys._getframe  # pyright: ignore[reportPrivateUsage]
+
 
 class Defer:
     @staticmethod
@@ -21,26 +24,30 @@ class Defer:
         Return value of the given callable will always be ignored.
         """
 
-        frame = get_outer_frame()
-        code_location = get_code_location(frame)
+        frame = _getframe(1)
         deferred_actions = ensure_deferred_actions(frame)
 
-        deferred_callable = _DeferredCallable(callable, code_location)
-        deferred_actions.append(deferred_callable)
+        # Only the parts of the code location are kept. It is formatted only when a warning is to be emitted.
+        deferred_callable = _DeferredCallable(callable, frame.f_code.co_filename, frame.f_lineno)
+        deferred_actions.append(deferred_callable.perform)
 
         return deferred_callable
 
 
 @final
-class _DeferredCallable(DeferredAction, Generic[_P]):
+class _DeferredCallable(Generic[_P]):
+    __slots__ = ("_body", "_filename", "_line_number", "_args_and_kwargs")
+
     _body: Final[Callable[..., Any]]
-    _code_location: Final[str]
+    _filename: Final[str]
+    _line_number: Final[int]
 
     _args_and_kwargs: tuple[tuple[Any, ...], dict[str, Any]] | None
 
-    def __init__(self, body: Callable[_P, Any], /, code_location: str) -> None:
+    def __init__(self, body: Callable[_P, Any], /, filename: str, line_number: int) -> None:
         self._body = body
-        self._code_location = code_location
+        self._filename = filename
+        self._line_number = line_number
 
         self._args_and_kwargs = None
 
@@ -72,6 +79,6 @@ class _DeferredCallable(DeferredAction, Generic[_P]):
             # This `TypeError` was raised on function call, which means that there was a signature error.
             # It is typically because a deferred callable with at least one required argument doesn't ever get further
             # called with appropriate arguments.
-            code_location = self._code_location
+            code_location = format_code_location(self._filename, self._line_number)
             message = f"`defer(...)` has never got further called ({code_location})."
             warn(message)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 __all__ = ["defer_scope"]
 
-import operator
+import sys
 from collections.abc import Callable, Iterable, Iterator
 from contextlib import AbstractContextManager
 from functools import update_wrapper
@@ -10,7 +10,7 @@ from types import FrameType, TracebackType
 from typing import Any, Final, Generic, ParamSpec, TypeVar, final, overload
 
 from ._deferred_actions import DeferredActions, callable_deferred_actions_recorder, context_deferred_actions_recorder
-from .._utils import get_current_frame, get_outer_frame
+from .._utils import report_unraisable_exception
 
 _Wrapped_t = TypeVar("_Wrapped_t")
 
@@ -19,6 +19,8 @@ _R = TypeVar("_R")
 
 _E = TypeVar("_E")
 
+_getframe = sys._getframe  # pyright: ignore[reportPrivateUsage]
+
 
 @overload
 def defer_scope() -> AbstractContextManager: ...
@@ -32,16 +34,31 @@ def defer_scope(wrapped: Any = None, /) -> Any:
     if wrapped is None:
         return _DeferScopeContextManager()
 
-    return update_wrapper(_DeferScopeWrapper(wrapped), wrapped)
+    wrapper = _DeferScopeWrapper(wrapped)
+
+    # Metadata is only copied for callables. A wrapped iterable gets neither `__wrapped__` nor attributes like `__name__`
+    # (which some iterables, e.g. generators, do have), since the wrapper only exists to be iterated over.
+    if callable(wrapped):
+        __ = update_wrapper(wrapper, wrapped)
+
+    return wrapper
 
 
 @final
-class _DeferScopeContextManager(AbstractContextManager):
-    _frame: FrameType | None = None
-    _deferred_actions: DeferredActions | None = None
+class _DeferScopeContextManager:
+    # Not derived from `AbstractContextManager`, which has no `__slots__` before Python 3.13. It is still recognized as
+    # one through `__subclasshook__()`.
+    __slots__ = ("_frame", "_deferred_actions")
+
+    _frame: FrameType | None
+    _deferred_actions: DeferredActions | None
+
+    def __init__(self, /) -> None:
+        self._frame = None
+        self._deferred_actions = None
 
     def __enter__(self, /) -> Any:
-        frame = get_outer_frame()
+        frame = _getframe(1)
         assert self._frame is None
         self._frame = frame
 
@@ -56,11 +73,13 @@ class _DeferScopeContextManager(AbstractContextManager):
     ) -> None:
         frame = self._frame
         assert frame is not None
-        del self._frame
+        self._frame = None
 
         deferred_actions = context_deferred_actions_recorder.teardown(frame)
         assert self._deferred_actions is deferred_actions
-        del self._deferred_actions
+        self._deferred_actions = None
+
+        _end_scope(deferred_actions, exc_value)
 
 
 @final
@@ -69,32 +88,57 @@ class _DeferScopeWrapper(Generic[_Wrapped_t]):
         self._wrapped: Final = wrapped
 
     def __call__(self: _DeferScopeWrapper[Callable[_P, _R]], /, *args: _P.args, **kwargs: _P.kwargs) -> _R:
-        frame = get_current_frame()
+        frame = _getframe()
 
         deferred_actions = callable_deferred_actions_recorder.setup(frame)
+        exception: BaseException | None = None
         try:
-            result = self._wrapped(*args, **kwargs)
+            return self._wrapped(*args, **kwargs)
+        except BaseException as e:
+            exception = e
+            raise
         finally:
             __ = callable_deferred_actions_recorder.teardown(frame)
             assert __ is deferred_actions
-            deferred_actions.drain()
-
-        return result
+            _end_scope(deferred_actions, exception)
 
     def __iter__(self: _DeferScopeWrapper[Iterable[_E]], /) -> Iterator[_E]:
-        frame = get_outer_frame()
+        frame = _getframe(1)
+        wrapped = self._wrapped
 
-        @iter
-        @operator.call
-        def _() -> Iterable[_E]:
-            for element in self._wrapped:
+        def generate() -> Iterator[_E]:
+            for element in wrapped:
                 deferred_actions = context_deferred_actions_recorder.setup(frame)
+                # An exception here is typically a `GeneratorExit`, which means that the loop has been left early.
+                exception: BaseException | None = None
                 try:
                     yield element
+                except BaseException as e:
+                    exception = e
+                    raise
                 finally:
                     __ = context_deferred_actions_recorder.teardown(frame)
                     assert __ is deferred_actions
-                    deferred_actions.drain()
+                    _end_scope(deferred_actions, exception)
 
-        iterator = _
+        iterator = generate()
         return iterator
+
+
+def _end_scope(deferred_actions: DeferredActions, exception: BaseException | None, /) -> None:
+    """
+    Performs deferred actions at the end of a scope.
+
+    If the scope is left with an exception, that exception takes
+    priority, and exceptions from the deferred actions are reported
+    through `sys.unraisablehook` instead of being raised.
+    """
+
+    if exception is None:
+        deferred_actions.drain_and_release()
+        return
+
+    try:
+        deferred_actions.drain_and_release()
+    except BaseException as e:
+        report_unraisable_exception(e, "Exception ignored while performing deferred actions")
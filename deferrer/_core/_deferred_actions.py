@@ -3,7 +3,6 @@ from __future__ import annotations
 __all__ = [
     "CallableDeferredActionsRecorder",
     "ContextDeferredActionsRecorder",
-    "DeferredAction",
     "DeferredActions",
     "callable_deferred_actions_recorder",
     "context_deferred_actions_recorder",
@@ -11,62 +10,132 @@ __all__ = [
 ]
 
 import sys
-from abc import ABC, abstractmethod
+from collections.abc import Callable
 from types import FrameType
 from typing import Any, Final, Never, cast, final
+from weakref import finalize
 
 from .._utils import is_class_frame, is_global_frame
 
 
-class DeferredAction(ABC):
+@final
+class DeferredActions:
     """
-    An object that stands for an action that is meant to be performed
-    later.
+    A list-like object that holds deferred actions, each being a
+    callable that takes no argument.
+
+    When a `DeferredActions` object is drained, all deferred actions it
+    holds will get performed in a FILO order.
     """
 
-    @abstractmethod
-    def perform(self, /) -> None: ...
+    __slots__ = ("_internal_list", "append", "__weakref__")
 
+    _internal_list: Final[list[Callable[[], Any]]]
 
-@final
-class DeferredActions:
+    append: Final[Callable[[Callable[[], Any]], None]]
     """
-    A list-like object that holds `DeferredAction` objects.
+    Appends a deferred action.
 
-    When a `DeferredActions` object is being disposed, all
-    `DeferredAction` objects it holds will get performed in a FILO
-    order.
+    It is the bound `append` method of the internal list, so that no
+    Python-level call is involved.
     """
 
-    _internal_list: Final[list[DeferredAction]]
-
     def __init__(self, /) -> None:
-        self._internal_list = []
+        internal_list: list[Callable[[], Any]] = []
+        self._internal_list = internal_list
+        self.append = internal_list.append
+
+    @staticmethod
+    def acquire() -> DeferredActions:
+        """
+        Returns an empty `DeferredActions` object, reusing a released one
+        if there is any.
+        """
+
+        try:
+            return _pool.pop()
+        except IndexError:
+            return DeferredActions()
+
+    def drain_and_release(self, /) -> None:
+        """
+        Drains this object and then puts it back for reuse.
+
+        The object must not be referenced anywhere else, as it may be
+        handed out again by `DeferredActions.acquire()`.
+
+        Actions appended while draining get performed as well, so that
+        the object is always empty when it is handed out again.
+
+        Examples
+        --------
+        >>> deferred_actions = DeferredActions.acquire()
+        >>> deferred_actions.append(lambda: print(0))
+        >>> deferred_actions.append(lambda: deferred_actions.append(lambda: print(1)))
+        >>> deferred_actions.drain_and_release()
+        0
+        1
+
+        >>> DeferredActions.acquire() is deferred_actions
+        True
+        >>> len(deferred_actions._internal_list)
+        0
+        """
+
+        try:
+            _drain(self._internal_list)
+        finally:
+            if len(_pool) < _MAX_POOL_SIZE:
+                _pool.append(self)
+
+    def drain_on_release(self, /) -> None:
+        """
+        Makes all held actions get performed when this object is
+        released without being drained explicitly.
+        """
+
+        __ = finalize(self, _drain, self._internal_list)
+
+
+_pool: Final[list[DeferredActions]] = []
+"""
+Released `DeferredActions` objects that are ready for reuse.
+"""
 
-    def append(self, deferred_call: DeferredAction, /) -> None:
-        self._internal_list.append(deferred_call)
+_MAX_POOL_SIZE: Final = 64
 
-    def drain(self, /) -> None:
-        exceptions: list[Exception] = []
 
-        internal_list = self._internal_list
-        while len(internal_list) > 0:
-            deferred_call = internal_list.pop()
+def _drain(internal_list: list[Callable[[], Any]], /) -> None:
+    # The list of exceptions is only created when there is any exception.
+    exceptions: list[Exception] | None = None
+    # A `BaseException` (e.g. `SystemExit`) is only re-raised after all the remaining actions have been performed.
+    base_exception: BaseException | None = None
 
+    # Actions appended while draining are performed in another round, so that the list is always left empty.
+    while len(internal_list) != 0:
+        # Detach the pending actions first, so that performing them never sees the list being changed.
+        pending_actions = internal_list[::-1]
+        internal_list.clear()
+
+        for deferred_action in pending_actions:
             try:
-                deferred_call.perform()
+                deferred_action()
             except Exception as e:
+                if exceptions is None:
+                    exceptions = []
                 exceptions.append(e)
+            except BaseException as e:
+                if base_exception is None:
+                    base_exception = e
 
-        n_exceptions = len(exceptions)
-        if n_exceptions == 0:
-            return
+    if base_exception is not None:
+        raise base_exception
 
-        exception_group = ExceptionGroup("deferred exception(s)", exceptions)
-        raise exception_group
+    if exceptions is None:
+        return
 
-    def __del__(self, /) -> None:
-        self.drain()
+    exception_group = ExceptionGroup("deferred exception(s)", exceptions)
+    raise exception_group
 
 
 @final
@@ -84,7 +153,7 @@ class CallableDeferredActionsRecorder:
     def setup(self, /, outer_frame: FrameType) -> DeferredActions:
         internal_dict = self._internal_dict
         assert outer_frame not in internal_dict
-        deferred_actions = DeferredActions()
+        deferred_actions = DeferredActions.acquire()
         internal_dict[outer_frame] = deferred_actions
         return deferred_actions
 
@@ -92,9 +161,8 @@ class CallableDeferredActionsRecorder:
         return self._internal_dict.pop(outer_frame)
 
     def get(self, /, frame: FrameType) -> DeferredActions | None:
-        outer_frame = frame.f_back
-        assert outer_frame is not None
-        deferred_actions = self._internal_dict.get(outer_frame)
+        # A frame without an outer frame has no record, and looking up `None` simply finds nothing.
+        deferred_actions = self._internal_dict.get(frame.f_back)  # pyright: ignore[reportArgumentType]
         return deferred_actions
 
 
@@ -111,31 +179,42 @@ class ContextDeferredActionsRecorder:
     context managers.
     """
 
-    _internal_dict: Final[dict[FrameType, list[DeferredActions]]]
+    # In the common case, there is only one active context manager in a frame, and its `DeferredActions` object is
+    # stored directly. A list is only used for nested context managers in the same frame.
+    _internal_dict: Final[dict[FrameType, DeferredActions | list[DeferredActions]]]
 
     def __init__(self, /) -> None:
         self._internal_dict = {}
 
     def setup(self, /, frame: FrameType) -> DeferredActions:
         internal_dict = self._internal_dict
-        deferred_actions_list = internal_dict.setdefault(frame, [])
-        deferred_actions = DeferredActions()
-        deferred_actions_list.append(deferred_actions)
+        deferred_actions = DeferredActions.acquire()
+        existing = internal_dict.get(frame)
+        if existing is None:
+            internal_dict[frame] = deferred_actions
+        elif isinstance(existing, DeferredActions):
+            internal_dict[frame] = [existing, deferred_actions]
+        else:
+            existing.append(deferred_actions)
         return deferred_actions
 
     def teardown(self, /, frame: FrameType) -> DeferredActions:
         internal_dict = self._internal_dict
-        deferred_actions_list = internal_dict[frame]
-        deferred_actions = deferred_actions_list.pop()
-        if len(deferred_actions_list) == 0:
+        existing = internal_dict[frame]
+        if isinstance(existing, DeferredActions):
+            del internal_dict[frame]
+            return existing
+
+        deferred_actions = existing.pop()
+        if len(existing) == 0:
             del internal_dict[frame]
         return deferred_actions
 
     def get(self, /, frame: FrameType) -> DeferredActions | None:
-        deferred_actions_list = self._internal_dict.get(frame)
-        if deferred_actions_list is None:
-            return None
-        deferred_actions = deferred_actions_list[-1]
+        existing = self._internal_dict.get(frame)
+        if existing is None or isinstance(existing, DeferredActions):
+            return existing
+        deferred_actions = existing[-1]
         return deferred_actions
 
 
@@ -145,6 +224,9 @@ The singleton instance of `ContextDeferredActionsRecorder`.
 """
 
 
+_CAN_INJECT_INTO_LOCAL_SCOPE: Final = sys.version_info >= (3, 12)
+
+
 def ensure_deferred_actions(
     frame: FrameType,
     *,
@@ -160,31 +242,36 @@ def ensure_deferred_actions(
     """
 
     # Try to find one in `context_deferred_actions_recorder` and then `callable_deferred_actions_recorder`.
-    for recorder in (context_deferred_actions_recorder, callable_deferred_actions_recorder):
-        deferred_actions = recorder.get(frame)
-        if deferred_actions is not None:
-            return deferred_actions
+    deferred_actions = context_deferred_actions_recorder.get(frame)
+    if deferred_actions is not None:
+        return deferred_actions
+    deferred_actions = callable_deferred_actions_recorder.get(frame)
+    if deferred_actions is not None:
+        return deferred_actions
 
     # No match. We shall check local scope soon.
 
     # There is no way to inject an object into a local scope in Python 3.11.
-    if sys.version_info < (3, 12):
+    if not _CAN_INJECT_INTO_LOCAL_SCOPE:
         raise RuntimeError("cannot inject deferred actions into local scope with Python older than 3.12")
 
-    # If we injected an object into a global scope or a class scope, it would not get released in time.
-    if is_global_frame(frame):
-        raise RuntimeError("cannot inject deferred actions into global scope")
-    if is_class_frame(frame):
-        raise RuntimeError("cannot inject deferred actions into class scope")
-
     local_scope = frame.f_locals
 
     # If one existing instance is already in the local scope, just reuse it.
+    # This is checked before the scope kind, as an instance can only have been injected into a function scope.
     deferred_actions = local_scope.get(__KEY__)
     if deferred_actions is not None:
         return deferred_actions
 
+    # If we injected an object into a global scope or a class scope, it would not get released in time.
+    if is_global_frame(frame):
+        raise RuntimeError("cannot inject deferred actions into global scope")
+    if is_class_frame(frame):
+        raise RuntimeError("cannot inject deferred actions into class scope")
+
     # We are now forced to deploy a new instance.
     deferred_actions = DeferredActions()
     local_scope[__KEY__] = deferred_actions
+    # Nobody is going to drain it explicitly. It gets drained when it is released along with the local scope.
+    deferred_actions.drain_on_release()
     return deferred_actions
@@ -1,3 +1,6 @@
+from ._code_cache import *
 from ._code_location import *
 from ._frame import *
+from ._line_table import *
 from ._opcode import *
+from ._unraisable import *
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+__all__ = ["CodeCache"]
+
+from types import CodeType
+from typing import Final, Generic, TypeVar, final
+from weakref import ReferenceType, ref
+
+_T = TypeVar("_T")
+
+
+@final
+class CodeCache(Generic[_T]):
+    """
+    A dict-like object that caches values derived from code objects.
+
+    Code objects are looked up by identity, and each entry gets dropped
+    as soon as its code object is released, so that dynamically created
+    code never gets kept alive by the cache.
+
+    Examples
+    --------
+    >>> cache = CodeCache[str]()
+
+    >>> def f():
+    ...     pass
+
+    >>> print(cache.get(f.__code__))
+    None
+
+    >>> cache.set(f.__code__, "f")
+    >>> print(cache.get(f.__code__))
+    f
+
+    >>> del f
+    >>> len(cache._internal_dict)
+    0
+    """
+
+    _internal_dict: Final[dict[int, tuple[ReferenceType[CodeType], _T]]]
+
+    def __init__(self, /) -> None:
+        self._internal_dict = {}
+
+    def get(self, code: CodeType, /) -> _T | None:
+        entry = self._internal_dict.get(id(code))
+        if entry is None:
+            return None
+        return entry[1]
+
+    def set(self, code: CodeType, value: _T, /) -> None:
+        internal_dict = self._internal_dict
+        key = id(code)
+
+        def callback(_: ReferenceType[CodeType], /) -> None:
+            del internal_dict[key]
+
+        internal_dict[key] = (ref(code, callback), value)
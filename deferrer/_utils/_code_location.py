@@ -10,5 +10,14 @@ def get_code_location(frame: FrameType, /) -> str:
 
     filename = frame.f_code.co_filename
     line_number = frame.f_lineno
+    code_location = format_code_location(filename, line_number)
+    return code_location
+
+
+def format_code_location(filename: str, line_number: int, /) -> str:
+    """
+    Formats a code location from its file name and line number.
+    """
+
     code_location = f"file: {filename!r}, line: {line_number}"
     return code_location
@@ -1,54 +1,20 @@
 from __future__ import annotations
 
-__all__ = ["get_current_frame", "get_outer_frame", "is_class_frame", "is_global_frame"]
-
-import re
-import sys
-from types import FrameType
-
-from ._opcode import Opcode, build_instruction_pattern
-
-
-def get_current_frame() -> FrameType:
-    """
-    Returns the frame of the caller.
-
-    Examples
-    --------
-    >>> def foo():  # L0
-    ...     frame = get_current_frame()
-    ...     print(
-    ...         frame.f_code.co_name,
-    ...         frame.f_lineno - frame.f_code.co_firstlineno,  # L4
-    ...     )
-
-    >>> foo()
-    foo 4
-    """
-
-    return sys._getframe(1)  # pyright: ignore[reportPrivateUsage]
-
-
-def get_outer_frame() -> FrameType:
-    """
-    Returns the frame of the caller of caller.
-
-    Examples
-    --------
-    >>> def foo():  # L0
-    ...     def inner():
-    ...         frame = get_outer_frame()
-    ...         print(
-    ...             frame.f_code.co_name,
-    ...             frame.f_lineno - frame.f_code.co_firstlineno,
-    ...         )
-    ...     inner()  # L7
-
-    >>> foo()
-    foo 7
-    """
-
-    return sys._getframe(2)  # pyright: ignore[reportPrivateUsage]
+__all__ = ["is_class_frame", "is_global_frame"]
+
+from inspect import CO_NEWLOCALS
+from types import CodeType, FrameType
+
+from ._code_cache import CodeCache
+from ._opcode import (
+    COPY_FREE_VARS,
+    EXTENDED_ARG,
+    LOAD_CONST,
+    LOAD_NAME,
+    RESUME,
+    STORE_NAME,
+    build_instruction_code_bytes,
+)
 
 
 def is_global_frame(frame: FrameType, /) -> bool:
@@ -73,6 +39,11 @@ def is_global_frame(frame: FrameType, /) -> bool:
     False
     """
 
+    # Function frames always have their own locals. Checking the flag first saves building a snapshot of their local
+    # variables in `frame.f_locals`.
+    if frame.f_code.co_flags & CO_NEWLOCALS:
+        return False
+
     return frame.f_locals is frame.f_globals
 
 
@@ -106,6 +77,17 @@ def is_class_frame(frame: FrameType, /) -> bool:
     False
     """
 
+    code = frame.f_code
+
+    is_class = _is_class_code_cache.get(code)
+    if is_class is None:
+        is_class = _is_class_code(code)
+        _is_class_code_cache.set(code, is_class)
+
+    return is_class
+
+
+def _is_class_code(code: CodeType, /) -> bool:
     # Typical class code will begin like:
     #
     #   RESUME
@@ -115,35 +97,36 @@ def is_class_frame(frame: FrameType, /) -> bool:
     #   STORE "__qualname__"
     #   ...
 
-    code = frame.f_code
-
     names = code.co_names
     if len(names) < 3 or names[0] != "__name__" or names[1] != "__module__" or names[2] != "__qualname__":
         return False
 
     code_bytes = code.co_code
-    if re.match(_PATTERN, code_bytes) is None:
-        return False
 
-    return True
-
-
-_PATTERN = re.compile(
-    pattern=(
-        "".join([
-            # "COPY_FREE_VARS ?". Optional.
-            "(?:%s)?" % build_instruction_pattern(Opcode.COPY_FREE_VARS),
-            # "RESUME". Optional.
-            "(?:%s)?" % build_instruction_pattern(Opcode.RESUME),
-            # "LOAD_NAME 0 (__name__)".
-            build_instruction_pattern(Opcode.LOAD_NAME, 0),
-            # "STORE_NAME 1 (__module__)".
-            build_instruction_pattern(Opcode.STORE_NAME, 1),
-            # "LOAD_CONST 0 {qualname}".
-            build_instruction_pattern(Opcode.LOAD_CONST, 0),
-            # "STORE_NAME 2 (__qualname__)"
-            build_instruction_pattern(Opcode.STORE_NAME, 2),
-        ]).encode("iso8859-1")
-    ),
-    flags=re.DOTALL,
-)
+    # Skip "COPY_FREE_VARS ?" and "RESUME", both of which are optional.
+    i_code_byte = 0
+    while code_bytes[i_code_byte] == EXTENDED_ARG:
+        i_code_byte += 2
+    if code_bytes[i_code_byte] == COPY_FREE_VARS:
+        i_code_byte += _COPY_FREE_VARS_SIZE
+    if code_bytes[i_code_byte] == RESUME:
+        i_code_byte += _RESUME_SIZE
+
+    return code_bytes.startswith(_CLASS_CODE_PREFIX, i_code_byte)
+
+
+_is_class_code_cache = CodeCache[bool]()
+
+_COPY_FREE_VARS_SIZE = len(build_instruction_code_bytes(COPY_FREE_VARS))
+_RESUME_SIZE = len(build_instruction_code_bytes(RESUME))
+
+_CLASS_CODE_PREFIX = b"".join([
+    # "LOAD_NAME 0 (__name__)".
+    build_instruction_code_bytes(LOAD_NAME, 0),
+    # "STORE_NAME 1 (__module__)".
+    build_instruction_code_bytes(STORE_NAME, 1),
+    # "LOAD_CONST 0 {qualname}".
+    build_instruction_code_bytes(LOAD_CONST, 0),
+    # "STORE_NAME 2 (__qualname__)"
+    build_instruction_code_bytes(STORE_NAME, 2),
+])
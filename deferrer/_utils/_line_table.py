@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+__all__ = ["build_single_line_table"]
+
+from typing import Final
+
+
+def build_single_line_table(n_code_bytes: int, line_delta: int, /) -> bytes:
+    """
+    Builds a line table (as in `co_linetable`) that maps all
+    instructions in the given number of code bytes to one line.
+
+    The line is given relative to `co_firstlineno` of the code object
+    that the line table is meant for. No column information is
+    recorded.
+
+    Examples
+    --------
+    >>> code = compile("a = 1\\nb = 2\\nc = 3", "<string>", "exec")
+    >>> code = code.replace(co_linetable=build_single_line_table(len(code.co_code), 1))
+    >>> sorted({line for _, _, line in code.co_lines()})
+    [2]
+    >>> sorted({positions for positions in code.co_positions()})
+    [(2, 2, None, None)]
+    """
+
+    line_table = bytearray()
+
+    n_code_units = n_code_bytes // 2
+    while n_code_units > 0:
+        # Each entry covers at most 8 code units.
+        n_entry_code_units = min(n_code_units, 8)
+        line_table.append(0x80 | (_NO_COLUMNS_CODE << 3) | (n_entry_code_units - 1))
+        _append_signed_varint(line_table, line_delta)
+        n_code_units -= n_entry_code_units
+
+        # Line numbers of following entries are relative to the previous one.
+        line_delta = 0
+
+    return bytes(line_table)
+
+
+def _append_signed_varint(line_table: bytearray, value: int, /) -> None:
+    unsigned_value = ((-value) << 1) | 1 if value < 0 else value << 1
+
+    # Chunks of 6 bits, with the lowest chunk coming first and a flag of 0x40 on all but the last one.
+    while unsigned_value >= 0x40:
+        line_table.append(0x40 | (unsigned_value & 0x3F))
+        unsigned_value >>= 6
+    line_table.append(unsigned_value)
+
+
+_NO_COLUMNS_CODE: Final = 13
+"""
+The location entry code for "line number only, with no column
+information".
+"""
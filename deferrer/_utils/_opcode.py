@@ -1,51 +1,78 @@
 from __future__ import annotations
 
-__all__ = ["Opcode", "build_instruction_code_bytes", "build_instruction_pattern", "extract_argument_from_instruction"]
+__all__ = [
+    "COPY_FREE_VARS",
+    "DELETE_DEREF",
+    "EXTENDED_ARG",
+    "JUMP_BACKWARD",
+    "LOAD_CONST",
+    "LOAD_DEREF",
+    "LOAD_NAME",
+    "MAKE_CELL",
+    "POP_TOP",
+    "RESUME",
+    "RETURN_VALUE",
+    "STORE_DEREF",
+    "STORE_FAST",
+    "STORE_NAME",
+    "append_instruction_code_bytes",
+    "build_instruction_code_bytes",
+    "extract_argument_from_instruction",
+    "iterate_instructions",
+]
 
 import sys
-from enum import IntEnum
+from collections.abc import Iterator
 from types import MappingProxyType
-from typing import cast
+from typing import Final
 
 from opcode import _cache_format  # pyright: ignore[reportAttributeAccessIssue]
 from opcode import opmap
 
+# All op-code values used in this project.
+#
+# They are plain `int` constants rather than members of an `IntEnum`, so that reading one is a single global lookup and
+# comparing one against a byte of `co_code` is a plain `int` comparison.
 
-class Opcode(IntEnum):
-    """
-    All op-code values used in this project.
-    """
+COPY_FREE_VARS: Final[int] = opmap["COPY_FREE_VARS"]
+DELETE_DEREF: Final[int] = opmap["DELETE_DEREF"]
+EXTENDED_ARG: Final[int] = opmap["EXTENDED_ARG"]
+JUMP_BACKWARD: Final[int] = opmap["JUMP_BACKWARD"]
+LOAD_CONST: Final[int] = opmap["LOAD_CONST"]
+LOAD_DEREF: Final[int] = opmap["LOAD_DEREF"]
+LOAD_NAME: Final[int] = opmap["LOAD_NAME"]
+MAKE_CELL: Final[int] = opmap["MAKE_CELL"]
+POP_TOP: Final[int] = opmap["POP_TOP"]
+RESUME: Final[int] = opmap["RESUME"]
+RETURN_VALUE: Final[int] = opmap["RETURN_VALUE"]
+STORE_DEREF: Final[int] = opmap["STORE_DEREF"]
+STORE_FAST: Final[int] = opmap["STORE_FAST"]
+STORE_NAME: Final[int] = opmap["STORE_NAME"]
+
+if sys.version_info >= (3, 13):
+    __all__ += ["TO_BOOL"]
 
-    COPY_FREE_VARS = opmap["COPY_FREE_VARS"]
-    EXTENDED_ARG = opmap["EXTENDED_ARG"]
-    JUMP_BACKWARD = opmap["JUMP_BACKWARD"]
-    LOAD_CONST = opmap["LOAD_CONST"]
-    LOAD_NAME = opmap["LOAD_NAME"]
-    MAKE_CELL = opmap["MAKE_CELL"]
-    POP_TOP = opmap["POP_TOP"]
-    RESUME = opmap["RESUME"]
-    RETURN_VALUE = opmap["RETURN_VALUE"]
-    STORE_FAST = opmap["STORE_FAST"]
-    STORE_NAME = opmap["STORE_NAME"]
-    STORE_DEREF = opmap["STORE_DEREF"]
+    TO_BOOL: Final[int] = opmap["TO_BOOL"]
 
-    if sys.version_info >= (3, 13):
-        TO_BOOL = opmap["TO_BOOL"]
+if sys.version_info >= (3, 12):
+    __all__ += ["POP_JUMP_IF_FALSE"]
 
-    if sys.version_info >= (3, 12):
-        POP_JUMP_IF_FALSE = opmap["POP_JUMP_IF_FALSE"]
+    POP_JUMP_IF_FALSE: Final[int] = opmap["POP_JUMP_IF_FALSE"]
 
-    if sys.version_info >= (3, 11) and sys.version_info < (3, 12):
-        JUMP_IF_FALSE_OR_POP = opmap["JUMP_IF_FALSE_OR_POP"]
+if sys.version_info >= (3, 11) and sys.version_info < (3, 12):
+    __all__ += ["JUMP_IF_FALSE_OR_POP"]
+
+    JUMP_IF_FALSE_OR_POP: Final[int] = opmap["JUMP_IF_FALSE_OR_POP"]
 
 
 _n_caches_map = MappingProxyType({
-    cast("Opcode", opcode): (0 if (d := _cache_format.get(name)) is None else sum(d.values()))
-    for name, opcode in Opcode._member_map_.items()
+    opcode: (0 if (d := _cache_format.get(name)) is None else sum(d.values())) for name, opcode in opmap.items()
 })
 
+_cache_code_bytes_map = MappingProxyType({opcode: bytes(n_caches * 2) for opcode, n_caches in _n_caches_map.items()})
+
 
-def build_instruction_code_bytes(opcode: Opcode, argument: int = 0) -> bytes:
+def build_instruction_code_bytes(opcode: int, argument: int = 0) -> bytes:
     assert 0 <= opcode <= ((1 << 8) - 1)
     assert 0 <= argument <= ((1 << 32) - 1)
 
@@ -53,7 +80,7 @@ def build_instruction_code_bytes(opcode: Opcode, argument: int = 0) -> bytes:
 
     code_byte_list: list[int] = []
     for argument_byte in argument_bytes[:-1]:
-        code_byte_list.append(Opcode.EXTENDED_ARG)
+        code_byte_list.append(EXTENDED_ARG)
         code_byte_list.append(argument_byte)
     else:
         code_byte_list.append(opcode)
@@ -64,46 +91,65 @@ def build_instruction_code_bytes(opcode: Opcode, argument: int = 0) -> bytes:
     return code_bytes
 
 
-def build_instruction_pattern(opcode: Opcode, argument: int | None = None) -> str:
-    if argument is None:
-        argument_bytes = None
-    else:
-        argument_bytes = _get_bytes(argument)
+def append_instruction_code_bytes(code_bytes: bytearray, opcode: int, argument: int = 0) -> None:
+    """
+    Appends an instruction to the given buffer in place.
 
-    pattern = ""
+    Same as `code_bytes += build_instruction_code_bytes(opcode, argument)`
+    but with no intermediate object for the common single-byte argument.
+    """
 
-    if argument_bytes is None:
-        pattern += r"(?:\x%02x.){0,3}" % Opcode.EXTENDED_ARG
-    else:
-        pattern += "".join(
-            r"\x%02x\x%02x" % (Opcode.EXTENDED_ARG, argument_byte) for argument_byte in argument_bytes[:-1]
-        )
+    if argument > 0xFF:
+        code_bytes += build_instruction_code_bytes(opcode, argument)
+        return
 
-    pattern += r"\x%02x" % opcode
+    code_bytes.append(opcode)
+    code_bytes.append(argument)
+    code_bytes += _cache_code_bytes_map[opcode]
 
-    if argument_bytes is None:
-        pattern += "."
-    else:
-        pattern += r"\x%02x" % argument_bytes[-1]
 
-    n_caches = _n_caches_map[opcode]
-    if n_caches > 0:
-        pattern += ".{%d}" % (n_caches * 2)
+def extract_argument_from_instruction(code_bytes: bytes, i_code_byte: int, /) -> int:
+    """
+    Extracts the argument of the instruction at the given position,
+    taking its leading "EXTENDED_ARG" instructions into account.
+    """
+
+    argument = code_bytes[i_code_byte + 1]
+
+    shift = 8
+    while i_code_byte >= 2 and code_bytes[i_code_byte - 2] == EXTENDED_ARG:
+        i_code_byte -= 2
+        argument |= code_bytes[i_code_byte + 1] << shift
+        shift += 8
+
+    return argument
 
-    return pattern
 
+def iterate_instructions(code_bytes: bytes, /) -> Iterator[tuple[int, int]]:
+    """
+    Iterates over the instructions in the given code bytes, yielding
+    pairs of op-code and argument.
+
+    "EXTENDED_ARG" instructions are folded into the arguments of their
+    following instructions, and cache entries are skipped.
+    """
 
-def extract_argument_from_instruction(code_bytes: bytes, /) -> int:
     argument = 0
+    i_code_byte = 0
+    n_code_bytes = len(code_bytes)
+    while i_code_byte < n_code_bytes:
+        opcode = code_bytes[i_code_byte]
+        argument |= code_bytes[i_code_byte + 1]
+        i_code_byte += 2
 
-    for i in range(0, len(code_bytes), 2):
-        argument <<= 8
-        argument |= code_bytes[i + 1]
+        if opcode == EXTENDED_ARG:
+            argument <<= 8
+            continue
 
-        if code_bytes[i] != Opcode.EXTENDED_ARG:
-            break
+        yield opcode, argument
 
-    return argument
+        argument = 0
+        i_code_byte += _n_caches_map[opcode] * 2
 
 
 def _get_bytes(value: int, /) -> bytes:
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+__all__ = ["report_unraisable_exception"]
+
+import sys
+from traceback import print_exception
+from types import TracebackType
+from typing import Any, final
+
+
+def report_unraisable_exception(exception: BaseException, err_msg: str, /) -> None:
+    """
+    Reports an exception that cannot be raised through
+    `sys.unraisablehook`, like the interpreter does for exceptions
+    raised in finalizers.
+
+    Examples
+    --------
+    >>> import sys
+
+    >>> def unraisablehook(unraisable):
+    ...     print(unraisable.err_msg, repr(unraisable.exc_value))
+
+    >>> sys.unraisablehook = unraisablehook
+    >>> report_unraisable_exception(ValueError("x"), "Exception ignored while testing")
+    Exception ignored while testing ValueError('x')
+    >>> sys.unraisablehook = sys.__unraisablehook__
+    """
+
+    unraisablehook = sys.unraisablehook
+    if unraisablehook is sys.__unraisablehook__:
+        # The default hook only accepts arguments created by the interpreter, so its output is reproduced here instead.
+        print(f"{err_msg}:", file=sys.stderr)
+        print_exception(exception, file=sys.stderr)
+        return
+
+    __ = unraisablehook(_UnraisableHookArgs(exception, err_msg))
+
+
+@final
+class _UnraisableHookArgs:
+    """
+    Arguments for `sys.unraisablehook`, with the same attributes as the
+    ones created by the interpreter.
+    """
+
+    __slots__ = ("exc_type", "exc_value", "exc_traceback", "err_msg", "object")
+
+    exc_type: type[BaseException]
+    exc_value: BaseException | None
+    exc_traceback: TracebackType | None
+    err_msg: str | None
+    object: Any
+
+    def __init__(self, exception: BaseException, err_msg: str, /) -> None:
+        self.exc_type = type(exception)
+        self.exc_value = exception
+        self.exc_traceback = exception.__traceback__
+        self.err_msg = err_msg
+        self.object = None
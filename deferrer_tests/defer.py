@@ -1405,6 +1405,89 @@ class Test__defer:
         f(1)
         assert nums == [0, -1, 1]
 
+    @staticmethod
+    def test__works_with_implicit_local_scope_readers() -> None:
+        """
+        Built-in functions like `locals()` and `eval()` may read any
+        variable in the local scope, so all variables are captured when
+        they are used.
+        """
+
+        def f() -> None:
+            a = 1  # pyright: ignore[reportUnusedVariable]
+            b = 2  # pyright: ignore[reportUnusedVariable]
+            defer and nums.append(eval("a + b"))
+            defer and exec("nums.append(b)")
+            defer and nums.append(locals()["b"])
+            defer and nums.append(vars()["a"])
+            defer and nums.append(sorted(locals()))
+            defer and nums.append(sorted(vars()))
+            defer and nums.append(dir())
+            a = -1  # pyright: ignore[reportUnusedVariable]
+            b = -2  # pyright: ignore[reportUnusedVariable]
+
+        if sys.version_info < (3, 12):
+            from deferrer import defer_scope
+
+            f = defer_scope(f)
+
+        nums = []
+        f()
+        # `nums` is a free variable here.
+        assert nums == [["a", "b", "nums"], ["a", "b", "nums"], ["a", "b", "nums"], 1, 2, 2, 3]
+
+    @staticmethod
+    def test__works_with_comprehensions_and_lambdas() -> None:
+        """
+        Variables referenced by comprehensions and lambdas in RHS are
+        captured as well.
+
+        Since Python 3.12, comprehensions get inlined and their loop
+        variables live in the current function. Since Python 3.13, some
+        pairs of their instructions get combined (e.g.
+        "STORE_FAST_LOAD_FAST").
+        """
+
+        def f() -> None:
+            a = 1
+            b = 2
+            defer and nums.append((a, b))
+            defer and nums.append([k * a + b for k in range(2)])
+            defer and nums.append({k: a for k in (b,)})
+            defer and nums.append((lambda: a + b)())
+            a = -1
+            b = -2
+
+        if sys.version_info < (3, 12):
+            from deferrer import defer_scope
+
+            f = defer_scope(f)
+
+        nums = []
+        f()
+        assert nums == [3, {2: 1}, [2, 3], (1, 2)]
+
+    @staticmethod
+    def test__works_with_variables_in_high_slots() -> None:
+        """
+        When there are more than 256 local variables, "EXTENDED_ARG" is
+        required to reference some of them.
+        """
+
+        from deferrer import defer_scope
+
+        source = "\n".join([
+            "@defer_scope",
+            "def f():",
+            *(f"    v{i} = {i}" for i in range(300)),
+            "    defer and nums.append((v0, v255, v256, v299))",
+            "    v256 = v299 = None",
+        ])
+        global_scope = {"defer": defer, "defer_scope": defer_scope, "nums": []}
+        exec(source, global_scope)
+        global_scope["f"]()
+        assert global_scope["nums"] == [(0, 255, 256, 299)]
+
     @staticmethod
     def test__emits_warning_for_unsupported_bool_conversion() -> None:
         """
@@ -1669,6 +1752,35 @@ class Test__deferred_call:
         assert b == 1
         assert c == 1
 
+    @staticmethod
+    def test__does_not_keep_code_alive() -> None:
+        """
+        Code objects of dynamically created functions get released after
+        `defer` has been used in them.
+        """
+
+        import gc
+        from weakref import ref
+
+        from deferrer import defer_scope
+
+        global_scope = {"defer": defer, "defer_scope": defer_scope, "nums": []}
+        source = "\n".join([
+            "@defer_scope",
+            "def f(x):",
+            "    defer and nums.append(x)",
+            "    defer and nums.append(0)",
+        ])
+        exec(source, global_scope)
+        f = global_scope["f"]
+        f(1)
+        assert global_scope["nums"] == [0, 1]
+
+        code_ref = ref(f.__wrapped__.__code__)
+        del f, global_scope
+        __ = gc.collect()
+        assert code_ref() is None
+
 
 class Test__deferred_exceptions:
     @staticmethod
@@ -1762,3 +1874,58 @@ class Test__deferred_exceptions:
         assert isinstance(e, ExceptionGroup)
         (e_0,) = e.exceptions
         assert isinstance(e_0, ZeroDivisionError)
+
+    @staticmethod
+    def test__do_not_stop_remaining_actions_on_base_exception() -> None:
+        """
+        If a deferred action raises a `BaseException` like `SystemExit`,
+        the remaining deferred actions still get performed before it
+        propagates.
+        """
+
+        from deferrer import defer_scope
+
+        nums = []
+
+        @defer_scope
+        def f() -> None:
+            defer and nums.append(0)
+            defer and sys.exit(3)
+            defer and nums.append(1)
+
+        with pytest.raises(SystemExit) as exc_info:
+            f()
+
+        assert exc_info.value.code == 3
+        assert nums == [1, 0]
+
+    @staticmethod
+    def test__have_formattable_tracebacks() -> None:
+        """
+        Tracebacks of exceptions raised in deferred actions can be
+        formatted, and they point at the lines where the actions are
+        deferred.
+        """
+
+        import traceback
+
+        from deferrer import defer_scope
+
+        @defer_scope
+        def f() -> None:
+            x = 0
+            defer and nums.append(1 / x)
+
+        nums = []
+        with pytest.raises(ExceptionGroup) as exc_info:
+            f()
+
+        (e_0,) = exc_info.value.exceptions
+        assert isinstance(e_0, ZeroDivisionError)
+
+        (*_, summary) = traceback.extract_tb(e_0.__traceback__)
+        assert summary.name == "f"
+        assert summary.line == "defer and nums.append(1 / x)"
+
+        formatted = "".join(traceback.format_exception(exc_info.value))
+        assert "defer and nums.append(1 / x)" in formatted
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import sys
+
+import pytest
+
 from deferrer import defer, defer_scope
 
 
@@ -105,3 +109,109 @@ class Test__defer_scope:
             defer and nums.append(0)
 
         assert nums == [1, 0, -1, 2, 0, -1, 3, 0, -1]
+
+    @staticmethod
+    def test__raises_deferred_exceptions_on_exit() -> None:
+        """
+        If any deferred action raises an exception when the context
+        manager exits normally, the exceptions get raised as an
+        `ExceptionGroup`.
+        """
+
+        def do_raise() -> None:
+            raise RuntimeError
+
+        with pytest.raises(ExceptionGroup) as exc_info:
+            with defer_scope():
+                defer and do_raise()
+
+        (e_0,) = exc_info.value.exceptions
+        assert isinstance(e_0, RuntimeError)
+
+    @staticmethod
+    def test__keeps_exception_from_body() -> None:
+        """
+        In all forms, if the scope ends with an exception, that exception
+        propagates, and exceptions from deferred actions are reported as
+        unraisable ones.
+        """
+
+        nums = []
+
+        def do_raise() -> None:
+            raise RuntimeError
+
+        def use_context_manager() -> None:
+            with defer_scope():
+                defer and nums.append(0)
+                defer and do_raise()
+                raise KeyError
+
+        @defer_scope
+        def use_function() -> None:
+            defer(nums.append)(0)
+            defer(do_raise)()
+            raise KeyError
+
+        def use_iterable() -> None:
+            for _ in defer_scope(range(2)):
+                defer and nums.append(0)
+                defer and do_raise()
+                raise KeyError
+
+        unraisable_exceptions: list[BaseException | None] = []
+
+        def unraisablehook(args: sys.UnraisableHookArgs, /) -> None:
+            unraisable_exceptions.append(args.exc_value)
+
+        old_unraisablehook = sys.unraisablehook
+        sys.unraisablehook = unraisablehook
+        try:
+            for f in [use_context_manager, use_function, use_iterable]:
+                with pytest.raises(KeyError):
+                    f()
+
+                assert nums == [0]
+                nums.clear()
+
+                (e,) = unraisable_exceptions
+                assert isinstance(e, ExceptionGroup)
+                (e_0,) = e.exceptions
+                assert isinstance(e_0, RuntimeError)
+                unraisable_exceptions.clear()
+        finally:
+            sys.unraisablehook = old_unraisablehook
+
+    @staticmethod
+    def test__can_be_nested_and_reentered_repeatedly() -> None:
+        """
+        Deferred actions never leak between scopes, however the scopes
+        are nested and re-entered.
+        """
+
+        nums = []
+
+        @defer_scope
+        def f(i: int) -> None:
+            defer and nums.append(i)
+
+        scope = defer_scope()
+        for _ in range(3):
+            with scope:
+                defer and nums.append(-1)
+
+                with defer_scope():
+                    defer and nums.append(-2)
+
+                    for j in defer_scope(range(2)):
+                        defer and nums.append(j)
+                        f(10 + j)
+
+                    # An empty scope in between.
+                    with defer_scope():
+                        pass
+
+                assert nums == [10, 0, 11, 1, -2]
+
+            assert nums == [10, 0, 11, 1, -2, -1]
+            nums.clear()